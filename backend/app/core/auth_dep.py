@@ -1,9 +1,19 @@
 """FastAPI dependency: verify Firebase ID token and inject uid + consultancyId."""
+import hmac
+from typing import TYPE_CHECKING
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.cache import get_cache, user_key, workspace_key
+from app.core.config import settings
 from app.core.firebase_admin import verify_id_token, get_db
+from app.core.metrics import tag_workspace
+
+if TYPE_CHECKING:
+    from google.cloud.firestore import DocumentSnapshot
 
 bearer_scheme = HTTPBearer()
+ops_bearer_scheme = HTTPBearer(auto_error=False)
 
 
 class CurrentUser:
@@ -26,12 +36,16 @@ async def get_current_user(
 
     uid = decoded["uid"]
 
-    # Look up consultancyId from Firestore user doc
-    db = get_db()
-    user_doc = db.collection("users").document(uid).get()
-    consultancy_id: str | None = None
-    if user_doc.exists:
-        consultancy_id = user_doc.to_dict().get("consultancyId")
+    # Look up consultancyId from Firestore user doc. Only cached once set: the
+    # dashboard assigns it with a browser write the backend never sees, so a
+    # cached "no consultancy yet" would turn into 403s right after onboarding.
+    def load_consultancy_id() -> str | None:
+        user_doc = get_db().collection("users").document(uid).get()
+        return user_doc.to_dict().get("consultancyId") if user_doc.exists else None
+
+    consultancy_id: str | None = get_cache().get_or_set(
+        user_key(uid), load_consultancy_id, settings.cache_user_ttl
+    )
 
     return CurrentUser(uid=uid, consultancy_id=consultancy_id)
 
@@ -44,3 +58,47 @@ def require_consultancy(user: CurrentUser = Depends(get_current_user)) -> Curren
             detail="User does not belong to a consultancy yet.",
         )
     return user
+
+
+def require_workspace_access(workspace_id: str, user: CurrentUser) -> "DocumentSnapshot | None":
+    """Raise 404/403 unless the workspace belongs to the user's consultancy.
+
+    Only the owning consultancyId is cached, never the workspace doc: the
+    settings page edits workspaces straight from the browser, so anything else
+    could be served stale. Returns the snapshot when the check had to read it
+    (a cache miss, or caching disabled) so callers needing its fields don't
+    read it twice; None means read it yourself.
+    """
+    loaded: list = []
+
+    def load_owner() -> str | None:
+        doc = get_db().collection("workspaces").document(workspace_id).get()
+        loaded.append(doc)
+        return doc.to_dict().get("consultancyId") if doc.exists else None
+
+    owner = get_cache().get_or_set(workspace_key(workspace_id), load_owner, settings.cache_workspace_ttl)
+    if owner is None:
+        raise HTTPException(404, "Workspace not found")
+    if owner != user.consultancy_id:
+        raise HTTPException(403, "Forbidden")
+    tag_workspace(workspace_id)
+    return loaded[0] if loaded else None
+
+
+def require_ops_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(ops_bearer_scheme),
+) -> None:
+    """Guard for /metrics and /debug/profile: bearer METRICS_TOKEN.
+
+    Both endpoints answer 404 until a token is configured.
+    """
+    if not settings.metrics_token:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), settings.metrics_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,380 @@
+"""Pluggable cache shared by the routers (auth lookups, workspace ACLs, repo lists).
+
+Backends, chosen with CACHE_BACKEND:
+  none    caching disabled (default)
+  memory  in-process LRU; invalidations only reach the worker that made the
+          write, so use it with a single worker only
+  sqlite  one SQLite file on tmpfs (/dev/shm) shared by every worker on the host
+  redis   any Redis-compatible server, shared across hosts
+
+Shared backends sit behind a small in-process LRU (CACHE_LOCAL_TTL seconds)
+so hot keys skip the round-trip. Values must be JSON-serialisable. `Cache.invalidate()` deletes from the backend
+and broadcasts the keys so every worker drops its local copy: Redis via
+pub/sub, SQLite via an invalidation log each worker polls.
+
+Invalidation only covers writes made through this API. The frontend also
+writes Firestore directly (creating a consultancy sets users/{uid}, the
+workspace settings page updates workspaces/{id}), and those writes never
+reach `invalidate()`. Only cache what such writes cannot change: the user's
+consultancyId once it is set, a workspace's owning consultancy, and data
+behind backend-only collections such as the GitHub integration.
+
+The cache is never the source of truth: if the backend is unreachable (Redis
+down, SQLite file locked or missing) the error is logged, the lookup counts
+as a miss and callers fall through to Firestore.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.lazy import lazy_module
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+redis = lazy_module("redis")
+
+CACHE_REQUESTS = registry.counter(
+    "comply_cache_requests_total",
+    "Cache lookups by key namespace and result.",
+    ("namespace", "result"),
+)
+
+InvalidationCallback = Callable[[List[str]], None]
+
+
+def _backend_errors() -> Tuple[type, ...]:
+    """Exceptions meaning "backend unavailable", without importing redis eagerly."""
+    errors: Tuple[type, ...] = (sqlite3.Error,)
+    if redis.loaded:
+        errors += (redis.RedisError,)
+    return errors
+
+
+# ─── Backends ─────────────────────────────────────────────────────────────────
+
+class CacheBackend:
+    """Stores JSON-encoded values. `shared` backends are visible to other workers."""
+
+    shared = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, keys: List[str]) -> None:
+        raise NotImplementedError
+
+    def publish_invalidation(self, keys: List[str]) -> None:
+        """Tell other workers these keys changed."""
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        """Register for invalidations published by other workers."""
+
+    def poll(self) -> None:
+        """Deliver pending invalidations (for backends without push)."""
+
+
+class NullBackend(CacheBackend):
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, keys):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Thread-safe LRU with per-entry TTL and an optional byte budget.
+
+    Used directly (without `Cache`) it can hold any value; pass `sizeof` to
+    say how many bytes a value counts against `max_bytes`.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 0, sizeof: Callable[[Any], int] = len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # 0 = count-bounded only
+        self._sizeof = sizeof
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self._bytes -= self._sizeof(value)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            size = self._sizeof(value)
+            if self.max_bytes and size > self.max_bytes:
+                return
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= self._sizeof(old[1])
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                self._bytes -= self._sizeof(self._data.popitem(last=False)[1][1])
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                entry = self._data.pop(key, None)
+                if entry is not None:
+                    self._bytes -= self._sizeof(entry[1])
+
+
+class SQLiteBackend(CacheBackend):
+    """Host-local cache shared by all workers through one SQLite file.
+
+    Put the file on tmpfs so it never touches disk. Expiry uses wall-clock
+    time because the value is read by other processes.
+    """
+
+    shared = True
+    _PURGE_EVERY = 256
+
+    def __init__(self, path: str, max_entries: int = 10_000, poll_interval: float = 0.5):
+        self.max_entries = max_entries
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS invalidations (id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT)"
+        )
+        self._last_seen = self._conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM invalidations"
+        ).fetchone()[0]
+        self._last_poll = time.monotonic()
+        self._writes = 0
+        self._callbacks: List[InvalidationCallback] = []
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            self._writes += 1
+            if self._writes % self._PURGE_EVERY == 0:
+                self._purge()
+
+    def _purge(self) -> None:
+        self._conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+        self._conn.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._conn.execute(
+            "DELETE FROM invalidations WHERE id < (SELECT MAX(id) FROM invalidations) - ?",
+            (self.max_entries,),
+        )
+
+    def delete(self, keys):
+        with self._lock:
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+
+    def publish_invalidation(self, keys):
+        with self._lock:
+            self._conn.executemany("INSERT INTO invalidations (key) VALUES (?)", [(k,) for k in keys])
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def poll(self):
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return
+        with self._lock:
+            self._last_poll = now
+            rows = self._conn.execute(
+                "SELECT id, key FROM invalidations WHERE id > ? ORDER BY id", (self._last_seen,)
+            ).fetchall()
+            if not rows:
+                return
+            self._last_seen = rows[-1][0]
+        keys = [key for _, key in rows]
+        for callback in self._callbacks:
+            callback(keys)
+
+
+class RedisBackend(CacheBackend):
+    """Redis (or any RESP-compatible server) with pub/sub invalidation."""
+
+    shared = True
+    CHANNEL = "comply:cache:invalidate"
+
+    def __init__(self, url: str, prefix: str = "comply:cache:"):
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._pubsub_thread = None
+
+    def get(self, key):
+        return self._client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self._client.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+
+    def delete(self, keys):
+        if keys:
+            self._client.delete(*(self.prefix + k for k in keys))
+
+    def publish_invalidation(self, keys):
+        self._client.publish(self.CHANNEL, "\n".join(keys))
+
+    def subscribe(self, callback):
+        def handler(message):
+            data = message["data"]
+            if isinstance(data, bytes):
+                data = data.decode()
+            callback(data.split("\n"))
+
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.CHANNEL: handler})
+        self._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+
+# ─── Cache facade ─────────────────────────────────────────────────────────────
+
+class Cache:
+    def __init__(self, backend: CacheBackend, local_ttl: float = 0.0, local_max_entries: int = 1_000):
+        self.backend = backend
+        self.local_ttl = local_ttl
+        self._local: Optional[MemoryBackend] = None
+        if backend.shared and local_ttl > 0:
+            self._local = MemoryBackend(local_max_entries)
+        try:
+            backend.subscribe(self._evict_local)
+        except _backend_errors():
+            # Without invalidations a local copy could outlive a write
+            logger.warning("cache invalidation subscribe failed; local layer disabled", exc_info=True)
+            self._local = None
+
+    def _evict_local(self, keys: List[str]) -> None:
+        if self._local is not None:
+            self._local.delete(keys)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        namespace = key.split(":", 1)[0]
+        raw = None
+        try:
+            self.backend.poll()  # before the local read, so invalidations land first
+            if self._local is not None:
+                raw = self._local.get(key)
+            if raw is None:
+                raw = self.backend.get(key)
+                if raw is not None and self._local is not None:
+                    self._local.set(key, raw, self.local_ttl)
+        except _backend_errors():
+            logger.warning("cache get %s failed; treating as a miss", key, exc_info=True)
+            raw = None
+        CACHE_REQUESTS.inc(namespace=namespace, result="miss" if raw is None else "hit")
+        return default if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        # JSON, never pickle: whoever can write to Redis or the tmpfs file
+        # must not be able to run code in the API workers
+        raw = json.dumps(value, separators=(",", ":")).encode()
+        try:
+            self.backend.set(key, raw, ttl)
+        except _backend_errors():
+            logger.warning("cache set %s failed", key, exc_info=True)
+            return
+        if self._local is not None:
+            self._local.set(key, raw, min(ttl, self.local_ttl))
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl: float) -> Any:
+        """Return the cached value, or call `loader` and cache it unless it is None."""
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop keys here, in the backend and in every other worker's local cache."""
+        keys_list = list(keys)
+        self._evict_local(keys_list)
+        try:
+            self.backend.delete(keys_list)
+            if self.backend.shared:
+                self.backend.publish_invalidation(keys_list)
+        except _backend_errors():
+            # Entries left behind expire with their TTL
+            logger.warning("cache invalidate %s failed", keys_list, exc_info=True)
+
+
+def _build_backend(name: str) -> CacheBackend:
+    if name == "memory":
+        return MemoryBackend(settings.cache_max_entries)
+    if name == "sqlite":
+        return SQLiteBackend(settings.cache_sqlite_path, settings.cache_max_entries)
+    if name == "redis":
+        return RedisBackend(settings.cache_redis_url)
+    if name == "none":
+        return NullBackend()
+    raise ValueError(f"Unknown CACHE_BACKEND {name!r} (expected memory, sqlite, redis or none)")
+
+
+_cache: Optional[Cache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Cache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    backend = _build_backend(settings.cache_backend)
+                except _backend_errors():
+                    logger.error("cache backend %r unavailable; caching disabled", settings.cache_backend, exc_info=True)
+                    backend = NullBackend()
+                _cache = Cache(backend, settings.cache_local_ttl)
+    return _cache
+
+
+# ─── Keys ─────────────────────────────────────────────────────────────────────
+# Central so writers and readers can't drift apart.
+
+def user_key(uid: str) -> str:
+    return f"user:{uid}"
+
+
+def workspace_key(workspace_id: str) -> str:
+    return f"workspace:{workspace_id}"
+
+
+def github_repos_key(workspace_id: str) -> str:
+    return f"gh_repos:{workspace_id}"
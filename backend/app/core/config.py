@@ -27,6 +27,11 @@ class Settings(BaseSettings):
     pinecone_index_name: str = "consultancy-agents"
     pinecone_environment: str = "us-east-1"
 
+    # GitHub rate-limit scheduling (per OAuth token)
+    github_interactive_reserve: int = 500   # requests background traffic may not touch
+    github_pace_below: int = 1000           # spread background calls once budget drops below this
+    github_interactive_max_wait: float = 10.0  # seconds before an interactive call gets a 429
+
     # Legal MCP server
     mcp_server_path: str = "../open-legal-compliance-mcp"
 
@@ -43,6 +48,29 @@ class Settings(BaseSettings):
     rag_top_k: int = 5
     tax_rate_tolerance: float = 0.05
 
+    # IaC parsing
+    iac_parse_workers: int = 0               # process pool size; 0 = one per core
+    iac_ast_cache_bytes: int = 64 * 1024 * 1024  # per-worker AST cache budget, bytes
+    iac_ast_cache_ttl: float = 3_600.0
+
+    # Cache (memory | sqlite | redis | none)
+    cache_backend: str = "none"  # memory is per worker: invalidations don't reach the others
+    cache_sqlite_path: str = "/dev/shm/comply-cache.sqlite3"
+    cache_redis_url: str = "redis://localhost:6379/0"
+    cache_max_entries: int = 10_000
+    cache_local_ttl: float = 5.0  # in-process layer in front of sqlite/redis
+    cache_user_ttl: float = 60.0
+    cache_workspace_ttl: float = 60.0
+    cache_github_repos_ttl: float = 300.0
+
+    # Startup
+    firebase_warmup: bool = True
+
+    # Observability
+    metrics_token: str = ""  # bearer token for /metrics and /debug/profile; unset = disabled
+    profiler_enabled: bool = False
+    profiler_interval_ms: int = 10
+
     @property
     def cors_origins(self) -> List[str]:
         return [o.strip() for o in self.allowed_origins.split(",")]
@@ -1,18 +1,32 @@
-"""Firebase Admin SDK initialisation (singleton)."""
+"""Firebase Admin SDK initialisation (singleton).
+
+The SDK (and the gRPC Firestore client behind it) is imported on first use, not
+at module import, so serving `/health` never pays for it. `warm_up()` is called
+from the FastAPI lifespan to do that work before the first real request.
+"""
 import os
 import json
-import firebase_admin
-from firebase_admin import credentials, firestore, auth
+import time
+from typing import TYPE_CHECKING
 from app.core.config import settings
+from app.core.metrics import record_firestore
+
+if TYPE_CHECKING:
+    import firebase_admin
+    from google.cloud import firestore
 
-_app: firebase_admin.App | None = None
+_app: "firebase_admin.App | None" = None
+_db: "firestore.Client | None" = None
 
 
-def get_firebase_app() -> firebase_admin.App:
+def get_firebase_app() -> "firebase_admin.App":
     global _app
     if _app is not None:
         return _app
 
+    import firebase_admin
+    from firebase_admin import credentials
+
     sa_path = settings.firebase_service_account_json
     if sa_path and os.path.exists(sa_path):
         cred = credentials.Certificate(sa_path)
@@ -35,11 +49,116 @@ def get_firebase_app() -> firebase_admin.App:
     return _app
 
 
-def get_db() -> firestore.Client:
-    get_firebase_app()
-    return firestore.client()
+# ─── Instrumented Firestore wrappers ─────────────────────────────────────────
+# Thin proxies over the client surface the routers use, so document reads and
+# writes, `add()` and query `get()`/`stream()` are counted and timed. Anything
+# else (transactions, batches, collection groups, list_documents) passes
+# straight through uncounted.
+
+class _Proxy:
+    def __init__(self, wrapped):
+        self._wrapped = wrapped
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+
+def _timed(op: str, collection: str, fn, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        record_firestore(op, collection, time.perf_counter() - start)
+
+
+def _builder(name: str):
+    """Query builder method that keeps the result wrapped."""
+    def build(self, *args, **kwargs) -> "_Query":
+        return _Query(getattr(self._wrapped, name)(*args, **kwargs), self._collection)
+    build.__name__ = name
+    return build
+
+
+class _Query(_Proxy):
+    def __init__(self, wrapped, collection: str):
+        super().__init__(wrapped)
+        self._collection = collection
+
+    where = _builder("where")
+    order_by = _builder("order_by")
+    limit = _builder("limit")
+    limit_to_last = _builder("limit_to_last")
+    offset = _builder("offset")
+    select = _builder("select")
+    start_at = _builder("start_at")
+    start_after = _builder("start_after")
+    end_at = _builder("end_at")
+    end_before = _builder("end_before")
+
+    def stream(self, *args, **kwargs):
+        # Materialise so the timer covers the round-trips, not just the generator
+        docs = _timed(
+            "query", self._collection, lambda: list(self._wrapped.stream(*args, **kwargs))
+        )
+        return iter(docs)
+
+    def get(self, *args, **kwargs):
+        return _timed("query", self._collection, self._wrapped.get, *args, **kwargs)
+
+
+class _CollectionRef(_Query):
+    def __init__(self, wrapped):
+        super().__init__(wrapped, wrapped.id)
+
+    def document(self, *args, **kwargs) -> "_DocumentRef":
+        return _DocumentRef(self._wrapped.document(*args, **kwargs))
+
+    def add(self, *args, **kwargs):
+        return _timed("write", self._collection, self._wrapped.add, *args, **kwargs)
+
+
+class _DocumentRef(_Proxy):
+    def __init__(self, wrapped):
+        super().__init__(wrapped)
+        self._collection = wrapped.parent.id
+
+    def collection(self, name: str) -> _CollectionRef:
+        return _CollectionRef(self._wrapped.collection(name))
+
+    def get(self, *args, **kwargs):
+        return _timed("read", self._collection, self._wrapped.get, *args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        return _timed("write", self._collection, self._wrapped.set, *args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        return _timed("write", self._collection, self._wrapped.update, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return _timed("delete", self._collection, self._wrapped.delete, *args, **kwargs)
+
+
+class _Client(_Proxy):
+    def collection(self, name: str) -> _CollectionRef:
+        return _CollectionRef(self._wrapped.collection(name))
+
+
+def get_db() -> _Client:
+    global _db
+    if _db is None:
+        get_firebase_app()
+        from firebase_admin import firestore
+        _db = firestore.client()
+    return _Client(_db)
 
 
 def verify_id_token(id_token: str) -> dict:
     get_firebase_app()
+    from firebase_admin import auth
     return auth.verify_id_token(id_token)
+
+
+def warm_up() -> None:
+    """Initialise the app, Firestore client and auth module ahead of traffic."""
+    get_db()
+    from firebase_admin import auth  # noqa: F401
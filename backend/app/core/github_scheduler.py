@@ -0,0 +1,234 @@
+"""Rate-limit-aware scheduling of GitHub API calls, per OAuth token.
+
+Every GitHub response carries X-RateLimit-Limit/Remaining/Reset. The
+`RateLimitTransport` records them per token and, before each call, decides
+whether it may go now, must be paced, or has to wait for the window to reset:
+
+- interactive calls (the default) go as long as any quota is left, and wait
+  at most `github_interactive_max_wait` seconds before `RateLimited` is
+  raised (app.main turns it into a 429);
+- background calls (scan workers, inside `background_priority()`) leave
+  `github_interactive_reserve` requests untouched, yield to waiting
+  interactive calls, and are spread evenly over what is left of the window
+  once the budget runs low. They queue rather than fail.
+
+Responses that are themselves rate-limited (403/429 with no quota or a
+Retry-After) are retried after the advertised wait. State is per process;
+each worker converges quickly because every response reports the real
+remaining quota.
+"""
+import asyncio
+import hashlib
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import InstrumentedTransport, current_tags, registry
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_priority: ContextVar[str] = ContextVar("_github_priority", default=INTERACTIVE)
+
+GITHUB_REQUESTS = registry.counter(
+    "comply_github_requests_total",
+    "GitHub API calls by workspace and priority.",
+    ("workspace", "priority"),
+)
+GITHUB_QUEUE_SECONDS = registry.counter(
+    "comply_github_queue_seconds_total",
+    "Time GitHub calls spent waiting on the rate-limit scheduler.",
+    ("workspace", "priority"),
+)
+GITHUB_REMAINING = registry.gauge(
+    "comply_github_ratelimit_remaining",
+    "Last reported X-RateLimit-Remaining for the workspace's token.",
+    ("workspace",),
+)
+
+
+class RateLimited(Exception):
+    """The token's quota won't allow an interactive call within the max wait."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"GitHub rate limit exhausted; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+@contextmanager
+def background_priority():
+    """Run GitHub calls inside the block as low-priority background traffic."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass
+class TokenQuota:
+    limit: int = 5000
+    remaining: Optional[int] = None  # unknown until the first response
+    reset_at: float = 0.0            # epoch seconds
+    blocked_until: float = 0.0       # secondary limit / Retry-After
+    used: int = 0
+    interactive_waiting: int = 0
+    next_background_at: float = 0.0
+
+    def _roll_window(self, now: float) -> None:
+        if self.remaining is not None and self.reset_at and now >= self.reset_at:
+            self.remaining = None  # new window; learn it from the next response
+
+    def delay(self, priority: str, now: float) -> float:
+        """Seconds until a call at `priority` may be sent (0 = now)."""
+        self._roll_window(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.remaining is None:
+            return 0.0
+        if priority == INTERACTIVE:
+            return 0.0 if self.remaining > 0 else max(self.reset_at - now, 0.0)
+
+        if self.interactive_waiting:
+            return 0.05
+        budget = self.remaining - settings.github_interactive_reserve
+        if budget <= 0:
+            return max(self.reset_at - now, 0.05)
+        if budget < settings.github_pace_below:
+            return max(self.next_background_at - now, 0.0)
+        return 0.0
+
+    def reserve(self, priority: str, now: float) -> None:
+        self.used += 1
+        if self.remaining is not None:
+            self.remaining = max(self.remaining - 1, 0)
+            budget = self.remaining - settings.github_interactive_reserve
+            if priority == BACKGROUND and 0 < budget < settings.github_pace_below:
+                self.next_background_at = now + max(self.reset_at - now, 0.0) / budget
+
+    def update(self, response: httpx.Response, now: float) -> None:
+        h = response.headers
+        if "x-ratelimit-remaining" in h:
+            self.remaining = int(h["x-ratelimit-remaining"])
+            self.limit = int(h.get("x-ratelimit-limit", self.limit))
+            self.reset_at = float(h.get("x-ratelimit-reset", self.reset_at))
+        if is_rate_limited(response):
+            retry_after = h.get("retry-after")
+            if retry_after is not None:
+                self.blocked_until = now + float(retry_after)
+            elif self.reset_at > now:
+                self.blocked_until = self.reset_at
+            else:
+                self.blocked_until = now + 60  # GitHub's advice for secondary limits
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "used": self.used,
+            "resetAt": self.reset_at or None,
+            "blockedUntil": self.blocked_until or None,
+        }
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        response.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in response.headers
+    )
+
+
+class RateLimitScheduler:
+    def __init__(self):
+        self._quotas: Dict[str, TokenQuota] = {}
+        self._by_workspace: Dict[str, str] = {}
+
+    def quota(self, token_key: str, workspace_id: str = "") -> TokenQuota:
+        quota = self._quotas.setdefault(token_key, TokenQuota())
+        if workspace_id:
+            self._by_workspace[workspace_id] = token_key
+        return quota
+
+    def for_workspace(self, workspace_id: str) -> Optional[TokenQuota]:
+        token_key = self._by_workspace.get(workspace_id)
+        return self._quotas.get(token_key) if token_key else None
+
+    async def acquire(self, quota: TokenQuota, priority: str) -> float:
+        """Wait for a slot; returns the seconds spent queued."""
+        start = time.monotonic()
+        if priority == INTERACTIVE:
+            quota.interactive_waiting += 1
+        try:
+            while True:
+                now = time.time()
+                delay = quota.delay(priority, now)
+                if delay <= 0:
+                    quota.reserve(priority, now)
+                    return time.monotonic() - start
+                waited = time.monotonic() - start
+                if priority == INTERACTIVE and waited + delay > settings.github_interactive_max_wait:
+                    raise RateLimited(delay)
+                await asyncio.sleep(min(delay, 1.0))
+        finally:
+            if priority == INTERACTIVE:
+                quota.interactive_waiting -= 1
+
+
+scheduler = RateLimitScheduler()
+
+
+def _token_key(request: httpx.Request) -> Optional[str]:
+    auth = request.headers.get("authorization")
+    if not auth:
+        return None
+    # Never keep raw tokens around as dict keys
+    return hashlib.sha256(auth.encode()).hexdigest()[:16]
+
+
+class RateLimitTransport(httpx.AsyncBaseTransport):
+    """httpx transport that runs authenticated calls through the scheduler."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, max_retries: int = 3):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+        self.max_retries = max_retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        token_key = _token_key(request)
+        if token_key is None:
+            return await self._transport.handle_async_request(request)
+
+        workspace = current_tags()["workspace"]
+        priority = _priority.get()
+        quota = scheduler.quota(token_key, workspace)
+        for attempt in range(self.max_retries + 1):
+            waited = await scheduler.acquire(quota, priority)
+            GITHUB_REQUESTS.inc(workspace=workspace, priority=priority)
+            GITHUB_QUEUE_SECONDS.inc(waited, workspace=workspace, priority=priority)
+
+            response = await self._transport.handle_async_request(request)
+            quota.update(response, time.time())
+            if quota.remaining is not None:
+                GITHUB_REMAINING.set(quota.remaining, workspace=workspace)
+            if not is_rate_limited(response) or attempt == self.max_retries:
+                return response
+            await response.aread()
+            await response.aclose()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def github_client(transport: Optional[httpx.AsyncBaseTransport] = None, **kwargs) -> httpx.AsyncClient:
+    """httpx client for GitHub: rate-limit scheduled, then instrumented.
+
+    The metrics transport sits inside the scheduler so outbound timings
+    measure GitHub itself, not time spent queued.
+    """
+    return httpx.AsyncClient(transport=RateLimitTransport(InstrumentedTransport(transport)), **kwargs)
@@ -0,0 +1,306 @@
+"""Shared IaC parsing service: parse each file once per scan, in a process pool.
+
+Terraform (.tf / .tf.json) and YAML (Kubernetes, CloudFormation, CI) are
+parsed in worker processes so CPU-bound parsing neither holds the GIL nor
+blocks the event loop; even a small HCL file costs more to parse than to
+ship to a worker. Only Dockerfiles, which are split line by line, are parsed
+in-process. Workers return the AST already JSON-encoded and zlib-compressed;
+that blob is what gets cached (keyed by kind + SHA-256 of the content) and
+handed between stages, and it is only decoded when a stage reads
+`ParsedFile.ast`. The rule engine, context packer, patch generator and
+re-scan QA therefore share one parse per file:
+
+    parser = IaCParser()                        # one per scan
+    parsed = await parser.parse_many({"main.tf": text, "k8s/app.yaml": text2})
+    parsed["main.tf"].ast                       # dict, decoded on first access
+
+Results also go into a per-worker LRU bounded by IAC_AST_CACHE_BYTES, so
+identical files in later scans skip parsing. It is kept apart from
+`get_cache()` so large ASTs never evict auth/ACL entries. YAML values JSON
+cannot represent (dates, binary) come back as strings.
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.cache import MemoryBackend
+from app.core.config import settings
+from app.core.metrics import registry
+
+TERRAFORM = "terraform"
+TERRAFORM_JSON = "terraform_json"
+YAML = "yaml"
+DOCKERFILE = "dockerfile"
+
+# Cheap enough to parse on the event loop; everything else goes to the pool
+INLINE_KINDS = (DOCKERFILE,)
+
+IAC_PARSES = registry.counter(
+    "comply_iac_parse_total",
+    "IaC files requested from the parser by kind and result (hit, parsed, error).",
+    ("kind", "result"),
+)
+
+
+def detect_kind(path: str) -> Optional[str]:
+    """IaC kind from a repo path, or None if the file isn't something we parse."""
+    name = os.path.basename(path).lower()
+    if name.endswith(".tf.json"):
+        return TERRAFORM_JSON
+    if name.endswith(".tf"):
+        return TERRAFORM
+    if name.endswith((".yaml", ".yml")):
+        return YAML
+    if name == "dockerfile" or name.startswith("dockerfile.") or name.endswith(".dockerfile"):
+        return DOCKERFILE
+    return None
+
+
+# ─── Parsers (run inside worker processes) ───────────────────────────────────
+
+def _parse_dockerfile(content: str) -> List[dict]:
+    """Instructions with their source line span; handles `\\` continuations."""
+    instructions = []
+    buf: List[str] = []
+    start = 0
+    for lineno, raw in enumerate(content.splitlines(), start=1):
+        line = raw.strip()
+        if not buf and (not line or line.startswith("#")):
+            continue
+        if not buf:
+            start = lineno
+        if line.endswith("\\"):
+            buf.append(line[:-1].strip())
+            continue
+        buf.append(line)
+        text = " ".join(part for part in buf if part and not part.startswith("#"))
+        buf = []
+        keyword, _, value = text.partition(" ")
+        instructions.append(
+            {"instruction": keyword.upper(), "value": value.strip(), "line_start": start, "line_end": lineno}
+        )
+    return instructions
+
+
+# CloudFormation short-form intrinsics whose long form isn't simply "Fn::<Name>"
+_CFN_LONG_FORMS = {"!Ref": "Ref", "!Condition": "Condition"}
+
+_yaml_loader = None
+
+
+def _get_yaml_loader():
+    """SafeLoader that also accepts application tags (`!Sub`, `!reference`, ...).
+
+    CloudFormation short forms become their JSON long form (`!Ref x` ->
+    {"Ref": "x"}, `!GetAtt a.b` -> {"Fn::GetAtt": ["a", "b"]}, `!Sub s` ->
+    {"Fn::Sub": s}), so rules see one shape whichever syntax the template
+    uses. Any other tag becomes {"!tag": value}.
+    """
+    global _yaml_loader
+    if _yaml_loader is None:
+        import yaml
+
+        def construct_tagged(loader, tag_suffix, node):
+            tag = "!" + tag_suffix
+            if isinstance(node, yaml.ScalarNode):
+                value = loader.construct_scalar(node)
+            elif isinstance(node, yaml.SequenceNode):
+                value = loader.construct_sequence(node, deep=True)
+            else:
+                value = loader.construct_mapping(node, deep=True)
+            if tag in _CFN_LONG_FORMS:
+                return {_CFN_LONG_FORMS[tag]: value}
+            if tag == "!GetAtt" and isinstance(value, str):
+                return {"Fn::GetAtt": value.split(".", 1)}
+            if tag_suffix[:1].isupper():
+                return {f"Fn::{tag_suffix}": value}
+            return {tag: value}
+
+        class IaCYamlLoader(yaml.SafeLoader):
+            pass
+
+        IaCYamlLoader.add_multi_constructor("!", construct_tagged)
+        _yaml_loader = IaCYamlLoader
+    return _yaml_loader
+
+
+def _parse(kind: str, content: str) -> Any:
+    if kind == TERRAFORM:
+        import hcl2
+        return hcl2.loads(content)
+    if kind == TERRAFORM_JSON:
+        return json.loads(content)
+    if kind == YAML:
+        import yaml
+        return [doc for doc in yaml.load_all(content, Loader=_get_yaml_loader()) if doc is not None]
+    if kind == DOCKERFILE:
+        return _parse_dockerfile(content)
+    raise ValueError(f"Unsupported IaC kind {kind!r}")
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":"), default=str).encode(), 1)
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def _parse_to_blob(kind: str, content: str) -> Tuple[bytes, Optional[str]]:
+    """Worker entry point: (encoded AST, error message)."""
+    try:
+        return _encode(_parse(kind, content)), None
+    except Exception as exc:
+        return _encode(None), f"{type(exc).__name__}: {exc}"
+
+
+# ─── Process pool ─────────────────────────────────────────────────────────────
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Never fork the API worker: its event loop, locks and client
+                # threads would be copied into the children half-held
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.iac_parse_workers or os.cpu_count(),
+                    mp_context=multiprocessing.get_context(method),
+                )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+# ─── AST cache ────────────────────────────────────────────────────────────────
+
+# (blob, error) tuples held as-is: no JSON/base64 round-trip, no copy on a hit
+_ast_cache: Optional[MemoryBackend] = None
+_ast_cache_lock = threading.Lock()
+
+
+def _result_size(result: Tuple[bytes, Optional[str]]) -> int:
+    return len(result[0]) + len(result[1] or "")
+
+
+def get_ast_cache() -> MemoryBackend:
+    global _ast_cache
+    if _ast_cache is None:
+        with _ast_cache_lock:
+            if _ast_cache is None:
+                _ast_cache = MemoryBackend(
+                    max_entries=100_000, max_bytes=settings.iac_ast_cache_bytes, sizeof=_result_size
+                )
+    return _ast_cache
+
+
+# ─── Service ──────────────────────────────────────────────────────────────────
+
+class ParsedFile:
+    """A parsed IaC file; the AST is decoded lazily and memoised."""
+
+    __slots__ = ("path", "kind", "digest", "blob", "error", "_ast", "_decoded")
+
+    def __init__(self, path: str, kind: str, digest: str, blob: bytes, error: Optional[str]):
+        self.path = path
+        self.kind = kind
+        self.digest = digest
+        self.blob = blob
+        self.error = error
+        self._ast: Any = None
+        self._decoded = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def ast(self) -> Any:
+        if not self._decoded:
+            self._ast = _decode(self.blob)
+            self._decoded = True
+        return self._ast
+
+
+class IaCParser:
+    """Per-scan parsing front end. Safe to share across the scan's stages."""
+
+    def __init__(self):
+        # content key -> (blob, error); the once-per-scan guarantee
+        self._results: Dict[str, Tuple[bytes, Optional[str]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def _key(kind: str, content: str) -> str:
+        return f"iac_ast:{kind}:{hashlib.sha256(content.encode()).hexdigest()}"
+
+    def _lookup(self, key: str, kind: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        result = self._results.get(key)
+        if result is None:
+            result = get_ast_cache().get(key)
+            if result is not None:
+                self._results[key] = result
+        if result is not None:
+            IAC_PARSES.inc(kind=kind, result="hit")
+        return result
+
+    def _store(self, key: str, kind: str, result: Tuple[bytes, Optional[str]]) -> None:
+        self._results[key] = result
+        get_ast_cache().set(key, result, settings.iac_ast_cache_ttl)
+        IAC_PARSES.inc(kind=kind, result="error" if result[1] else "parsed")
+
+    def _wrap(self, path: str, kind: str, key: str, result: Tuple[bytes, Optional[str]]) -> ParsedFile:
+        return ParsedFile(path, kind, key.rsplit(":", 1)[1], result[0], result[1])
+
+    async def parse_many(self, files: Dict[str, str]) -> Dict[str, ParsedFile]:
+        """Parse every recognised file concurrently; unknown kinds are skipped."""
+        loop = asyncio.get_running_loop()
+        pending: Dict[str, Tuple[str, str, asyncio.Future]] = {}
+        parsed: Dict[str, ParsedFile] = {}
+
+        for path, content in files.items():
+            kind = detect_kind(path)
+            if kind is None:
+                continue
+            key = self._key(kind, content)
+            result = self._lookup(key, kind)
+            if result is not None:
+                parsed[path] = self._wrap(path, kind, key, result)
+                continue
+            future = self._inflight.get(key)
+            if future is None:
+                if kind in INLINE_KINDS:
+                    future = loop.create_future()
+                    future.set_result(_parse_to_blob(kind, content))
+                else:
+                    future = loop.run_in_executor(get_pool(), _parse_to_blob, kind, content)
+                self._inflight[key] = future
+            pending[path] = (kind, key, future)
+
+        for path, (kind, key, future) in pending.items():
+            try:
+                result = await future
+            except BaseException:
+                self._inflight.pop(key, None)
+                raise
+            # Only the first path waiting on a given content stores the result
+            if self._inflight.pop(key, None) is not None:
+                self._store(key, kind, result)
+            parsed[path] = self._wrap(path, kind, key, result)
+        return parsed
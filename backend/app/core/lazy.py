@@ -0,0 +1,62 @@
+"""Deferred imports for heavy optional stacks.
+
+The agent/RAG dependencies (LangGraph, Gemini, Pinecone, pdfplumber, PyGithub)
+add seconds to every worker start but are only needed once a scan runs or a
+document is ingested. Bind them with `lazy_module()` at module level; the real
+import happens on first attribute access:
+
+    genai = lazy_module("google.generativeai")
+    ...
+    genai.configure(api_key=settings.gemini_api_key)   # imported here
+"""
+import importlib
+import threading
+from types import ModuleType
+from typing import Optional
+
+# Modules that must never be imported just to serve the API.
+# benchmarks/startup.py fails if `import app.main` pulls any of these in.
+HEAVY_MODULES = (
+    "google.cloud.firestore",
+    "firebase_admin.firestore",
+    "langgraph",
+    "langchain_google_genai",
+    "langchain_mcp_adapters",
+    "google.generativeai",
+    "pinecone",
+    "pdfplumber",
+    "github",
+    "docx",
+    "openpyxl",
+    "tiktoken",
+    "hcl2",
+)
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    return LazyModule(name)
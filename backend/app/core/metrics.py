@@ -0,0 +1,344 @@
+"""In-process metrics: counters, latency histograms and Prometheus text export.
+
+Every request gets a timing context (see `MetricsMiddleware`) that collects
+Firestore, outbound HTTP and LLM time so it can be reported back in a
+`Server-Timing` header.
+
+Series are labelled with a workspace only once its access check has passed
+(`tag_workspace()`, called from `require_workspace_access`), never from the raw
+request path, so made-up IDs can't create series. Scan IDs are unbounded and
+are kept out of labels altogether. Calls made outside a request (scan
+workers) can set their own tags with `tagged()`.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+# ─── Metric types ─────────────────────────────────────────────────────────────
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(l, "")) for l in self.labels)
+
+    def _fmt_labels(self, values: LabelValues, extra: str = "") -> str:
+        parts = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{self._fmt_labels(key)} {_num(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        for key, row in items:
+            for bound, count in zip(self.buckets, row):
+                le = self._fmt_labels(key, f'le="{_num(bound)}"')
+                yield f"{self.name}_bucket{le} {_num(count)}"
+            inf = self._fmt_labels(key, 'le="+Inf"')
+            yield f"{self.name}_bucket{inf} {_num(row[-1])}"
+            yield f"{self.name}_sum{self._fmt_labels(key)} {_num(row[-2])}"
+            yield f"{self.name}_count{self._fmt_labels(key)} {_num(row[-1])}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Histogram:
+        return self.register(Histogram(name, help, labels))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+# ─── Registry + metric definitions ────────────────────────────────────────────
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    "comply_http_request_duration_seconds",
+    "API request latency by route template.",
+    ("method", "route", "status"),
+)
+FIRESTORE_OPS = registry.counter(
+    "comply_firestore_operations_total",
+    "Firestore reads/writes/queries issued through get_db().",
+    ("op", "collection", "workspace"),
+)
+FIRESTORE_SECONDS = registry.counter(
+    "comply_firestore_seconds_total",
+    "Time spent in Firestore calls.",
+    ("op", "collection", "workspace"),
+)
+OUTBOUND_REQUESTS = registry.counter(
+    "comply_outbound_http_requests_total",
+    "Outbound httpx requests by host and response status.",
+    ("host", "status", "workspace"),
+)
+OUTBOUND_SECONDS = registry.counter(
+    "comply_outbound_http_seconds_total",
+    "Time spent waiting on outbound httpx requests.",
+    ("host", "workspace"),
+)
+LLM_CALLS = registry.counter(
+    "comply_llm_calls_total",
+    "LLM calls by model and outcome.",
+    ("model", "outcome", "workspace"),
+)
+LLM_SECONDS = registry.counter(
+    "comply_llm_seconds_total",
+    "Time spent waiting on LLM calls.",
+    ("model", "workspace"),
+)
+
+
+# ─── Request context ──────────────────────────────────────────────────────────
+
+# Per-request Server-Timing accumulator: name -> [seconds, count]
+_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("_timings", default=None)
+# [workspace, scan]; a mutable list so tags set in a handler reach code that
+# runs later in the same request, including threadpool dependencies
+_tags: ContextVar[Optional[List[str]]] = ContextVar("_tags", default=None)
+
+
+def current_tags() -> Dict[str, str]:
+    workspace, scan = _tags.get() or ("", "")
+    return {"workspace": workspace, "scan": scan}
+
+
+def label_tags() -> Dict[str, str]:
+    """The subset of tags safe to use as Prometheus labels."""
+    return {"workspace": current_tags()["workspace"]}
+
+
+def tag_workspace(workspace_id: str) -> None:
+    """Tag the rest of the request with a workspace the user may access."""
+    tags = _tags.get()
+    if tags is None:
+        _tags.set([workspace_id, ""])
+    else:
+        tags[0] = workspace_id
+
+
+@contextmanager
+def tagged(workspace_id: str = "", scan_id: str = ""):
+    """Tag metrics recorded inside the block with a workspace and scan."""
+    token = _tags.set([workspace_id, scan_id])
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+def record_timing(name: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is None:
+        return
+    slot = timings.setdefault(name, [0.0, 0])
+    slot[0] += seconds
+    slot[1] += 1
+
+
+def record_firestore(op: str, collection: str, seconds: float) -> None:
+    tags = label_tags()
+    FIRESTORE_OPS.inc(op=op, collection=collection, **tags)
+    FIRESTORE_SECONDS.inc(seconds, op=op, collection=collection, **tags)
+    record_timing("firestore", seconds)
+
+
+@contextmanager
+def track_llm(model: str):
+    """Time an LLM call: `with track_llm(settings.gemini_model): ...`."""
+    tags = label_tags()
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        LLM_CALLS.inc(model=model, outcome=outcome, **tags)
+        LLM_SECONDS.inc(elapsed, model=model, **tags)
+        record_timing("llm", elapsed)
+
+
+def _server_timing_header(total: float, timings: Dict[str, List[float]]) -> str:
+    parts = [f"app;dur={total * 1000:.1f}"]
+    for name, (seconds, count) in timings.items():
+        parts.append(f'{name};desc="{int(count)} calls";dur={seconds * 1000:.1f}')
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tags_token = _tags.set(["", ""])
+        timings: Dict[str, List[float]] = {}
+        timings_token = _timings.set(timings)
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                header = _server_timing_header(time.perf_counter() - start, timings)
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", header.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Starlette's router writes the matched route back into scope
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=str(status["code"]),
+            )
+            _timings.reset(timings_token)
+            _tags.reset(tags_token)
+
+
+# ─── Outbound HTTP ────────────────────────────────────────────────────────────
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that counts and times every outbound request."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tags = label_tags()
+        host = request.url.host
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            OUTBOUND_REQUESTS.inc(host=host, status=status, **tags)
+            OUTBOUND_SECONDS.inc(elapsed, host=host, **tags)
+            record_timing("http", elapsed)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def http_client(**kwargs) -> httpx.AsyncClient:
+    """Drop-in for `httpx.AsyncClient()` with metrics attached."""
+    kwargs.setdefault("transport", InstrumentedTransport())
+    return httpx.AsyncClient(**kwargs)
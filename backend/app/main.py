@@ -1,13 +1,45 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.core import firebase_admin, iac_parser, profiler as profiling
+from app.core.auth_dep import require_ops_token
 from app.core.config import settings
+from app.core.github_scheduler import RateLimited
+from app.core.metrics import MetricsMiddleware, registry
 from app.routers import consultancies, workspaces, github, scans, plans
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.firebase_warmup:
+        # Pay the Firebase/Firestore import + client setup before taking traffic.
+        # A failure here is logged, not fatal, so /health still answers.
+        try:
+            await asyncio.to_thread(firebase_admin.warm_up)
+        except Exception:
+            logger.exception("Firebase warm-up failed; will retry on first request")
+    if settings.profiler_enabled:
+        # Started from the event-loop thread, so that's the thread it samples
+        profiling.profiler = profiling.SamplingProfiler(settings.profiler_interval_ms)
+        profiling.profiler.start()
+    yield
+    iac_parser.shutdown_pool()
+    if profiling.profiler is not None:
+        profiling.profiler.stop()
+
+
 app = FastAPI(
     title="Comply API",
     description="Infrastructure compliance scanning and remediation platform",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # ─── CORS ─────────────────────────────────────────────────────────────────────
@@ -19,6 +51,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ─── Metrics ──────────────────────────────────────────────────────────────────
+app.add_middleware(MetricsMiddleware)
+
 # ─── Routers ──────────────────────────────────────────────────────────────────
 app.include_router(consultancies.router)
 app.include_router(workspaces.router)
@@ -27,6 +62,30 @@ app.include_router(scans.router)
 app.include_router(plans.router)
 
 
+@app.exception_handler(RateLimited)
+async def github_rate_limited(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "GitHub rate limit exhausted for this workspace; try again later."},
+        headers={"Retry-After": str(int(exc.retry_after) + 1)},
+    )
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok", "service": "comply-api"}
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_ops_token)])
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/profile", include_in_schema=False, dependencies=[Depends(require_ops_token)])
+async def debug_profile(reset: bool = False):
+    if profiling.profiler is None:
+        return PlainTextResponse("profiler disabled (set PROFILER_ENABLED=true)\n", status_code=404)
+    body = profiling.profiler.collapsed()
+    if reset:
+        profiling.profiler.reset()
+    return PlainTextResponse(body)
@@ -1,9 +1,9 @@
 """Consultancy router – create and get."""
 from fastapi import APIRouter, Depends, HTTPException
-from google.cloud import firestore
 from datetime import datetime, timezone
 
 from app.core.auth_dep import get_current_user, CurrentUser
+from app.core.cache import get_cache, user_key
 from app.core.firebase_admin import get_db
 from app.models.schemas import CreateConsultancyRequest, ConsultancyResponse
 
@@ -44,6 +44,7 @@ async def create_consultancy(
     db.collection("users").document(user.uid).update(
         {"consultancyId": consultancy_ref.id, "role": "owner"}
     )
+    get_cache().invalidate(user_key(user.uid))
 
     return ConsultancyResponse(
         id=consultancy_ref.id,
@@ -2,29 +2,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime, timezone
 from typing import List
-import httpx
 
-from app.core.auth_dep import require_consultancy, CurrentUser
+from app.core.auth_dep import require_consultancy, require_workspace_access, CurrentUser
+from app.core.cache import get_cache, github_repos_key
 from app.core.firebase_admin import get_db
 from app.core.encryption import encrypt, decrypt
 from app.core.config import settings
+from app.core.github_scheduler import github_client, scheduler
 from app.models.schemas import GitHubConnectRequest, ConnectRepoRequest
 
 router = APIRouter(tags=["github"])
 
 
-def _assert_workspace_access(workspace_id: str, user: CurrentUser) -> dict:
-    """Return workspace data or raise 403/404."""
-    db = get_db()
-    doc = db.collection("workspaces").document(workspace_id).get()
-    if not doc.exists:
-        raise HTTPException(404, "Workspace not found")
-    data = doc.to_dict()
-    if data.get("consultancyId") != user.consultancy_id:
-        raise HTTPException(403, "Forbidden")
-    return data
-
-
 # ─── OAuth Exchange ───────────────────────────────────────────────────────────
 
 @router.post("/workspaces/{workspace_id}/github/connect")
@@ -33,10 +22,10 @@ async def connect_github(
     body: GitHubConnectRequest,
     user: CurrentUser = Depends(require_consultancy),
 ):
-    _assert_workspace_access(workspace_id, user)
+    require_workspace_access(workspace_id, user)
 
     # Exchange code for access token
-    async with httpx.AsyncClient() as client:
+    async with github_client() as client:
         resp = await client.post(
             "https://github.com/login/oauth/access_token",
             params={
@@ -56,7 +45,7 @@ async def connect_github(
     access_token = token_data["access_token"]
 
     # Fetch GitHub username
-    async with httpx.AsyncClient() as client:
+    async with github_client() as client:
         user_resp = await client.get(
             "https://api.github.com/user",
             headers={"Authorization": f"Bearer {access_token}"},
@@ -81,6 +70,7 @@ async def connect_github(
     db.collection("workspaces").document(workspace_id).update(
         {"githubUsername": github_user["login"]}
     )
+    get_cache().invalidate(github_repos_key(workspace_id))
 
     return {"connected": True, "githubUsername": github_user["login"]}
 
@@ -92,7 +82,12 @@ async def list_github_repos(
     workspace_id: str,
     user: CurrentUser = Depends(require_consultancy),
 ):
-    _assert_workspace_access(workspace_id, user)
+    require_workspace_access(workspace_id, user)
+
+    cache = get_cache()
+    cached = cache.get(github_repos_key(workspace_id))
+    if cached is not None:
+        return {"repos": cached}
 
     db = get_db()
     gh_doc = (
@@ -107,7 +102,7 @@ async def list_github_repos(
 
     access_token = decrypt(gh_doc.to_dict()["accessToken"])
 
-    async with httpx.AsyncClient() as client:
+    async with github_client() as client:
         resp = await client.get(
             "https://api.github.com/user/repos",
             params={"per_page": 100, "sort": "updated"},
@@ -116,12 +111,27 @@ async def list_github_repos(
     resp.raise_for_status()
     repos = resp.json()
 
-    return {
-        "repos": [
-            {"full_name": r["full_name"], "default_branch": r["default_branch"]}
-            for r in repos
-        ]
-    }
+    result = [
+        {"full_name": r["full_name"], "default_branch": r["default_branch"]}
+        for r in repos
+    ]
+    cache.set(github_repos_key(workspace_id), result, settings.cache_github_repos_ttl)
+    return {"repos": result}
+
+
+# ─── Rate-limit Usage ─────────────────────────────────────────────────────────
+
+@router.get("/workspaces/{workspace_id}/github/rate-limit")
+async def github_rate_limit(
+    workspace_id: str,
+    user: CurrentUser = Depends(require_consultancy),
+):
+    """Quota of the workspace's GitHub token as last reported by GitHub."""
+    require_workspace_access(workspace_id, user)
+    quota = scheduler.for_workspace(workspace_id)
+    if quota is None:
+        return {"known": False}
+    return {"known": True, **quota.snapshot()}
 
 
 # ─── Connect a Repo ───────────────────────────────────────────────────────────
@@ -132,7 +142,7 @@ async def connect_repo(
     body: ConnectRepoRequest,
     user: CurrentUser = Depends(require_consultancy),
 ):
-    _assert_workspace_access(workspace_id, user)
+    require_workspace_access(workspace_id, user)
 
     db = get_db()
     ref = (
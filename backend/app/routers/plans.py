@@ -2,23 +2,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime, timezone
 
-from app.core.auth_dep import require_consultancy, CurrentUser
+from app.core.auth_dep import require_consultancy, require_workspace_access, CurrentUser
 from app.core.firebase_admin import get_db
 
 router = APIRouter(tags=["plans"])
 
 
-def _assert_workspace(workspace_id: str, user: CurrentUser) -> dict:
-    db = get_db()
-    doc = db.collection("workspaces").document(workspace_id).get()
-    if not doc.exists:
-        raise HTTPException(404, "Workspace not found")
-    data = doc.to_dict()
-    if data.get("consultancyId") != user.consultancy_id:
-        raise HTTPException(403, "Forbidden")
-    return data
-
-
 @router.post("/workspaces/{workspace_id}/scans/{scan_id}/plans/{plan_id}/approve")
 async def approve_plan(
     workspace_id: str,
@@ -26,7 +15,7 @@ async def approve_plan(
     plan_id: str,
     user: CurrentUser = Depends(require_consultancy),
 ):
-    _assert_workspace(workspace_id, user)
+    require_workspace_access(workspace_id, user)
     db = get_db()
     ref = (
         db.collection("workspaces")
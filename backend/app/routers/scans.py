@@ -2,24 +2,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime, timezone
 
-from app.core.auth_dep import require_consultancy, CurrentUser
+from app.core.auth_dep import require_consultancy, require_workspace_access, CurrentUser
 from app.core.firebase_admin import get_db
 from app.models.schemas import TriggerScanRequest
 
 router = APIRouter(tags=["scans"])
 
 
-def _assert_workspace_access(workspace_id: str, user: CurrentUser) -> dict:
-    db = get_db()
-    doc = db.collection("workspaces").document(workspace_id).get()
-    if not doc.exists:
-        raise HTTPException(404, "Workspace not found")
-    data = doc.to_dict()
-    if data.get("consultancyId") != user.consultancy_id:
-        raise HTTPException(403, "Forbidden")
-    return data
-
-
 # ─── Trigger Scan ─────────────────────────────────────────────────────────────
 
 @router.post("/workspaces/{workspace_id}/scans", status_code=202)
@@ -28,7 +17,7 @@ async def trigger_scan(
     body: TriggerScanRequest,
     user: CurrentUser = Depends(require_consultancy),
 ):
-    _assert_workspace_access(workspace_id, user)
+    require_workspace_access(workspace_id, user)
     db = get_db()
 
     # Verify repo exists
@@ -68,7 +57,7 @@ async def get_scan(
     scan_id: str,
     user: CurrentUser = Depends(require_consultancy),
 ):
-    _assert_workspace_access(workspace_id, user)
+    require_workspace_access(workspace_id, user)
     db = get_db()
     doc = (
         db.collection("workspaces").document(workspace_id).collection("scans").document(scan_id).get()
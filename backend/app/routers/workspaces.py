@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from datetime import datetime, timezone
 from typing import List
 
-from app.core.auth_dep import require_consultancy, CurrentUser
+from app.core.auth_dep import require_consultancy, require_workspace_access, CurrentUser
 from app.core.firebase_admin import get_db
 from app.models.schemas import (
     CreateWorkspaceRequest,
@@ -68,11 +68,11 @@ async def get_workspace(
     workspace_id: str,
     user: CurrentUser = Depends(require_consultancy),
 ):
-    db = get_db()
-    doc = db.collection("workspaces").document(workspace_id).get()
+    # Always serve a fresh read: the settings page updates this doc from the
+    # browser. The access check already did that read unless it hit the cache.
+    doc = require_workspace_access(workspace_id, user)
+    if doc is None:
+        doc = get_db().collection("workspaces").document(workspace_id).get()
     if not doc.exists:
         raise HTTPException(404, "Workspace not found")
-    data = doc.to_dict()
-    if data.get("consultancyId") != user.consultancy_id:
-        raise HTTPException(403, "Forbidden")
-    return _ws_to_response(doc.id, data)
+    return _ws_to_response(doc.id, doc.to_dict())
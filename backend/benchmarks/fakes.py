@@ -0,0 +1,185 @@
+"""In-memory stand-ins for Firestore and the GitHub API used by the benchmarks.
+
+`FakeFirestore` implements the slice of the google-cloud-firestore client
+surface the routers touch (collection/document/get/set/update/where/order_by/
+stream). Calls block for `latency_ms`, like the real synchronous client does.
+`fake_github_app()` is an ASGI app serving the GitHub endpoints the backend
+calls, mounted in-process through `httpx.ASGITransport`.
+"""
+import asyncio
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from google.api_core.exceptions import NotFound
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Per-request op counter, set by the harness around each call
+op_counts: ContextVar[Optional[Dict[str, int]]] = ContextVar("op_counts", default=None)
+
+
+# ─── Firestore ────────────────────────────────────────────────────────────────
+
+class FakeSnapshot:
+    def __init__(self, ref: "FakeDocumentRef", data: Optional[dict]):
+        self.reference = ref
+        self.id = ref.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[dict]:
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field: str) -> Any:
+        return (self._data or {}).get(field)
+
+
+class FakeQuery:
+    def __init__(self, store: "FakeFirestore", path: str, filters=(), order=None, limit=None):
+        self._store = store
+        self._path = path
+        self._filters = list(filters)
+        self._order = order
+        self._limit = limit
+
+    @property
+    def id(self) -> str:
+        return self._path.rsplit("/", 1)[-1]
+
+    def where(self, field: str, op: str, value: Any) -> "FakeQuery":
+        if op != "==":
+            raise NotImplementedError(f"FakeFirestore only supports '==' filters, got {op!r}")
+        return FakeQuery(self._store, self._path, self._filters + [(field, value)], self._order, self._limit)
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "FakeQuery":
+        return FakeQuery(self._store, self._path, self._filters, (field, direction), self._limit)
+
+    def limit(self, count: int) -> "FakeQuery":
+        return FakeQuery(self._store, self._path, self._filters, self._order, count)
+
+    def stream(self):
+        self._store._tick("query")
+        prefix = self._path + "/"
+        rows = [
+            (path, data)
+            for path, data in self._store.docs.items()
+            if path.startswith(prefix)
+            and "/" not in path[len(prefix):]
+            and all(data.get(f) == v for f, v in self._filters)
+        ]
+        if self._order:
+            field, direction = self._order
+            rows.sort(key=lambda r: r[1].get(field) or "", reverse=direction == "DESCENDING")
+        if self._limit is not None:
+            rows = rows[: self._limit]
+        for path, data in rows:
+            yield FakeSnapshot(FakeDocumentRef(self._store, path), data)
+
+    def get(self) -> List[FakeSnapshot]:
+        return list(self.stream())
+
+
+class FakeCollectionRef(FakeQuery):
+    def document(self, doc_id: Optional[str] = None) -> "FakeDocumentRef":
+        return FakeDocumentRef(self._store, f"{self._path}/{doc_id or uuid.uuid4().hex[:20]}")
+
+    def add(self, data: dict):
+        ref = self.document()
+        ref.set(data)
+        return None, ref
+
+
+class FakeDocumentRef:
+    def __init__(self, store: "FakeFirestore", path: str):
+        self._store = store
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self) -> FakeCollectionRef:
+        return FakeCollectionRef(self._store, self.path.rsplit("/", 1)[0])
+
+    def collection(self, name: str) -> FakeCollectionRef:
+        return FakeCollectionRef(self._store, f"{self.path}/{name}")
+
+    def get(self) -> FakeSnapshot:
+        self._store._tick("read")
+        return FakeSnapshot(self, self._store.docs.get(self.path))
+
+    def set(self, data: dict, merge: bool = False) -> None:
+        self._store._tick("write")
+        if merge and self.path in self._store.docs:
+            self._store.docs[self.path].update(data)
+        else:
+            self._store.docs[self.path] = dict(data)
+
+    def update(self, data: dict) -> None:
+        self._store._tick("write")
+        if self.path not in self._store.docs:
+            raise NotFound(f"No document to update: {self.path}")
+        self._store.docs[self.path].update(data)
+
+    def delete(self) -> None:
+        self._store._tick("delete")
+        self._store.docs.pop(self.path, None)
+
+
+class FakeFirestore:
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.docs: Dict[str, dict] = {}
+
+    def collection(self, name: str) -> FakeCollectionRef:
+        return FakeCollectionRef(self, name)
+
+    def _tick(self, op: str) -> None:
+        counts = op_counts.get()
+        if counts is not None:
+            counts[op] = counts.get(op, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+# ─── GitHub ───────────────────────────────────────────────────────────────────
+
+def fake_github_app(latency_ms: float = 0.0, repo_count: int = 100) -> Starlette:
+    """Serves the GitHub OAuth + REST endpoints the backend calls."""
+    latency = latency_ms / 1000
+    repos = [
+        {"full_name": f"bench-org/repo-{i}", "default_branch": "main"}
+        for i in range(repo_count)
+    ]
+    quota = {"remaining": 5000}
+
+    def _headers() -> Dict[str, str]:
+        quota["remaining"] = max(quota["remaining"] - 1, 0)
+        return {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": str(quota["remaining"]),
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        }
+
+    async def access_token(request: Request):
+        await asyncio.sleep(latency)
+        return JSONResponse({"access_token": "gho_bench", "token_type": "bearer"})
+
+    async def user(request: Request):
+        await asyncio.sleep(latency)
+        return JSONResponse({"login": "bench-user"}, headers=_headers())
+
+    async def user_repos(request: Request):
+        await asyncio.sleep(latency)
+        per_page = int(request.query_params.get("per_page", 30))
+        return JSONResponse(repos[:per_page], headers=_headers())
+
+    return Starlette(
+        routes=[
+            Route("/login/oauth/access_token", access_token, methods=["POST"]),
+            Route("/user", user),
+            Route("/user/repos", user_repos),
+        ]
+    )
@@ -0,0 +1,317 @@
+"""Load-test harness for the Comply API.
+
+Boots `app.main:app` in-process against `FakeFirestore` and a fake GitHub API,
+replays a weighted mix of realistic traffic and reports p50/p95/p99 latency,
+throughput and Firestore operations per endpoint.
+
+    cd backend
+    python -m benchmarks.run                       # default mix, saves results
+    python -m benchmarks.run --requests 2000 --concurrency 32
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+
+Results are written to benchmarks/results/latest.json. With --compare, any
+endpoint whose p95 regresses by more than --tolerance exits non-zero. Latency
+depends on the machine, so record a baseline on the same host you compare on:
+
+    python -m benchmarks.run --output benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+
+from cryptography.fernet import Fernet
+
+# Settings are read at import time, so configure before importing the app
+os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+
+import httpx  # noqa: E402
+
+from benchmarks.fakes import FakeFirestore, fake_github_app, op_counts  # noqa: E402
+
+RESULTS_DIR = Path(__file__).parent / "results"
+USER_ID = "bench-user"
+CONSULTANCY_ID = "bench-consultancy"
+
+
+# ─── Boot ─────────────────────────────────────────────────────────────────────
+
+def boot(args) -> SimpleNamespace:
+    """Import the app with Firestore, Firebase Auth and GitHub swapped for fakes."""
+    from app.core import auth_dep, firebase_admin, github_scheduler
+    from app.core.encryption import encrypt
+    from app.routers import github
+
+    db = FakeFirestore(latency_ms=args.firestore_latency_ms)
+    firebase_admin._app = object()  # skip credential loading
+    firebase_admin._db = db
+    auth_dep.verify_id_token = lambda token: {"uid": token}
+
+    gh_transport = httpx.ASGITransport(app=fake_github_app(args.github_latency_ms))
+    github.github_client = lambda **kw: github_scheduler.github_client(transport=gh_transport, **kw)
+
+    workspaces = seed(db, encrypt, args.workspaces)
+
+    from app.main import app
+    return SimpleNamespace(app=app, db=db, workspaces=workspaces)
+
+
+def seed(db: FakeFirestore, encrypt, n_workspaces: int) -> List[dict]:
+    """Populate one consultancy with workspaces, repos, scans and plans."""
+    now = datetime.now(timezone.utc).isoformat()
+    db.docs[f"users/{USER_ID}"] = {"consultancyId": CONSULTANCY_ID, "role": "owner"}
+    db.docs[f"consultancies/{CONSULTANCY_ID}"] = {
+        "name": "Bench Consultancy", "createdBy": USER_ID, "plan": "hackathon", "createdAt": now,
+    }
+    token = encrypt("gho_bench")
+    seeded = []
+    for w in range(n_workspaces):
+        ws = f"ws-{w}"
+        base = f"workspaces/{ws}"
+        db.docs[base] = {
+            "consultancyId": CONSULTANCY_ID,
+            "clientName": f"Client {w}",
+            "clientIndustry": "Fintech",
+            "complianceFrameworks": ["GDPR", "SOC2"],
+            "cloudProvider": "AWS",
+            "infrastructureType": "Terraform",
+            "status": "active",
+            "createdBy": USER_ID,
+            "createdAt": now,
+            "githubUsername": "bench-user",
+        }
+        db.docs[f"{base}/integrations/github"] = {
+            "mode": "oauth", "accessToken": token, "githubUsername": "bench-user", "connectedAt": now,
+        }
+        repos, scans = [], []
+        for r in range(3):
+            db.docs[f"{base}/repos/repo-{r}"] = {
+                "fullName": f"bench-org/repo-{r}", "defaultBranch": "main",
+                "connectedAt": now, "isActive": True,
+            }
+            repos.append(f"repo-{r}")
+        for s in range(5):
+            db.docs[f"{base}/scans/scan-{s}"] = {
+                "repoId": "repo-0", "commitSha": "HEAD", "status": "completed",
+                "triggeredBy": USER_ID, "startedAt": now,
+            }
+            for p in range(2):
+                db.docs[f"{base}/scans/scan-{s}/plans/plan-{p}"] = {"approved": False}
+            scans.append(f"scan-{s}")
+        seeded.append({"id": ws, "repos": repos, "scans": scans})
+    return seeded
+
+
+# ─── Traffic mix ──────────────────────────────────────────────────────────────
+# Each scenario is a short user journey; weights approximate production traffic.
+
+async def dashboard_load(call, ws, rng):
+    await call("GET /workspaces", "GET", "/workspaces")
+    await call("GET /workspaces/{id}", "GET", f"/workspaces/{ws['id']}")
+
+
+async def workspace_list(call, ws, rng):
+    await call("GET /workspaces", "GET", "/workspaces")
+
+
+async def repo_listing(call, ws, rng):
+    await call("GET /workspaces/{id}/github/repos", "GET", f"/workspaces/{ws['id']}/github/repos")
+
+
+async def scan_trigger_poll(call, ws, rng):
+    resp = await call(
+        "POST /workspaces/{id}/scans", "POST", f"/workspaces/{ws['id']}/scans",
+        json={"repo_id": rng.choice(ws["repos"])},
+    )
+    scan_id = resp.json()["scanId"]
+    for _ in range(3):
+        await call("GET /workspaces/{id}/scans/{scan}", "GET", f"/workspaces/{ws['id']}/scans/{scan_id}")
+
+
+async def plan_approval(call, ws, rng):
+    scan = rng.choice(ws["scans"])
+    await call("GET /workspaces/{id}/scans/{scan}", "GET", f"/workspaces/{ws['id']}/scans/{scan}")
+    await call(
+        "POST .../plans/{plan}/approve", "POST",
+        f"/workspaces/{ws['id']}/scans/{scan}/plans/plan-{rng.randrange(2)}/approve",
+    )
+
+
+SCENARIOS = {
+    "dashboard_load": (dashboard_load, 30),
+    "workspace_list": (workspace_list, 25),
+    "repo_listing": (repo_listing, 15),
+    "scan_trigger_poll": (scan_trigger_poll, 20),
+    "plan_approval": (plan_approval, 10),
+}
+
+
+# ─── Runner ───────────────────────────────────────────────────────────────────
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    idx = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+async def run_load(env, args) -> dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    ops: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    errors: Dict[str, int] = defaultdict(int)
+    rng = random.Random(args.seed)
+    names = [n for n in SCENARIOS if n in args.scenarios]
+    weights = [SCENARIOS[n][1] for n in names]
+    plan = [rng.choices(names, weights)[0] for _ in range(args.requests)]
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    transport = httpx.ASGITransport(app=env.app)
+    headers = {"Authorization": f"Bearer {USER_ID}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+
+        async def call(endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+            counts: Dict[str, int] = {}
+            token = op_counts.set(counts)
+            start = time.perf_counter()
+            try:
+                resp = await client.request(method, url, **kwargs)
+            finally:
+                latencies[endpoint].append(time.perf_counter() - start)
+                op_counts.reset(token)
+                for op, n in counts.items():
+                    ops[endpoint][op] += n
+            if resp.status_code >= 400:
+                errors[endpoint] += 1
+            return resp
+
+        async def worker(worker_id: int):
+            wrng = random.Random(args.seed + worker_id)
+            while True:
+                try:
+                    name = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await SCENARIOS[name][0](call, wrng.choice(env.workspaces), wrng)
+
+        # Warm-up pass so import/first-call costs don't skew the percentiles
+        await workspace_list(call, env.workspaces[0], rng)
+        latencies.clear()
+        ops.clear()
+        errors.clear()
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        wall = time.perf_counter() - wall_start
+
+    endpoints = {}
+    for endpoint, values in sorted(latencies.items()):
+        values.sort()
+        n = len(values)
+        endpoints[endpoint] = {
+            "requests": n,
+            "errors": errors.get(endpoint, 0),
+            "p50_ms": round(percentile(values, 50) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "p99_ms": round(percentile(values, 99) * 1000, 3),
+            "throughput_rps": round(n / wall, 2),
+            "firestore_ops_per_request": {op: round(c / n, 2) for op, c in sorted(ops[endpoint].items())},
+        }
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            k: getattr(args, k)
+            for k in ("requests", "concurrency", "workspaces", "seed",
+                      "firestore_latency_ms", "github_latency_ms", "scenarios")
+        },
+        "wall_seconds": round(wall, 3),
+        "total_requests": total,
+        "throughput_rps": round(total / wall, 2),
+        "endpoints": endpoints,
+    }
+
+
+# ─── Reporting ────────────────────────────────────────────────────────────────
+
+def print_report(result: dict) -> None:
+    header = f"{'endpoint':<40} {'n':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}  firestore ops/req"
+    print(header)
+    print("─" * len(header))
+    for endpoint, s in result["endpoints"].items():
+        fs = ", ".join(f"{op}={n}" for op, n in s["firestore_ops_per_request"].items())
+        print(
+            f"{endpoint:<40} {s['requests']:>6} {s['errors']:>4} {s['p50_ms']:>8.2f} "
+            f"{s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f} {s['throughput_rps']:>8.1f}  {fs}"
+        )
+    print(f"\n{result['total_requests']} requests in {result['wall_seconds']}s "
+          f"({result['throughput_rps']} req/s), latencies in ms")
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return a line per endpoint whose p95 or Firestore op count regressed."""
+    regressions = []
+    for endpoint, base in baseline.get("endpoints", {}).items():
+        cur = result["endpoints"].get(endpoint)
+        if cur is None:
+            continue
+        if cur["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {base['p95_ms']}ms -> {cur['p95_ms']}ms")
+        base_ops = sum(base["firestore_ops_per_request"].values())
+        cur_ops = sum(cur["firestore_ops_per_request"].values())
+        if cur_ops > base_ops:
+            regressions.append(f"{endpoint}: firestore ops/req {base_ops} -> {cur_ops}")
+    return regressions
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--requests", type=int, default=500, help="scenario iterations to run")
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--workspaces", type=int, default=20)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--firestore-latency-ms", type=float, default=2.0)
+    p.add_argument("--github-latency-ms", type=float, default=40.0)
+    p.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    p.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    p.add_argument("--compare", type=Path, help="baseline results JSON to check for regressions")
+    p.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown (0.2 = 20%%)")
+    return p.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    env = boot(args)
+    result = asyncio.run(run_load(env, args))
+    print_report(result)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2))
+    print(f"results saved to {args.output}")
+
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS vs", args.compare)
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nno regressions vs {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
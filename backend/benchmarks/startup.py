@@ -0,0 +1,119 @@
+"""Cold-start benchmark: import cost of the API process, per module.
+
+Each measurement runs in a fresh interpreter with `python -X importtime`, so
+nothing is cached between runs. Reports the cumulative import time of
+`app.main` and of each heavy dependency on its own, and fails if importing
+`app.main` drags in anything listed in `app.core.lazy.HEAVY_MODULES`.
+
+    cd backend
+    python -m benchmarks.startup
+    python -m benchmarks.startup --compare benchmarks/results/startup-baseline.json
+
+Results are written to benchmarks/results/startup.json. Record a baseline
+on the same host before comparing:
+
+    python -m benchmarks.startup --output benchmarks/results/startup-baseline.json
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional
+
+from app.core.lazy import HEAVY_MODULES
+
+BACKEND_DIR = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# What an API worker imports, then the dependencies that should stay deferred
+MODULES = ("app.main", "fastapi", "httpx", "cryptography.fernet", "firebase_admin") + HEAVY_MODULES
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str) -> Optional[Dict[str, int]]:
+    """Import `module` in a fresh interpreter; return {module: cumulative_us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        return None  # not installed in this environment
+    profile = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            profile[m.group(4)] = int(m.group(2))
+    return profile
+
+
+def measure(module: str, repeat: int) -> Optional[dict]:
+    runs = [import_profile(module) for _ in range(repeat)]
+    if any(r is None for r in runs):
+        return None
+    return {
+        "cumulative_ms": round(median(r[module] for r in runs) / 1000, 1),
+        "profile": runs[-1],
+    }
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--repeat", type=int, default=3, help="fresh interpreters per module (median taken)")
+    p.add_argument("--output", type=Path, default=RESULTS_DIR / "startup.json")
+    p.add_argument("--compare", type=Path, help="baseline startup JSON to check for regressions")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    args = p.parse_args(argv)
+
+    results: Dict[str, Optional[float]] = {}
+    app_profile: Dict[str, int] = {}
+    for module in MODULES:
+        m = measure(module, args.repeat)
+        results[module] = m["cumulative_ms"] if m else None
+        if module == "app.main" and m:
+            app_profile = m["profile"]
+        shown = f"{m['cumulative_ms']:>9.1f} ms" if m else "  not installed"
+        print(f"{module:<28} {shown}")
+
+    leaked = sorted(h for h in HEAVY_MODULES if h in app_profile)
+    top = sorted(
+        ((mod, us) for mod, us in app_profile.items() if mod.count(".") == 0),
+        key=lambda kv: kv[1], reverse=True,
+    )[:10]
+    print("\nheaviest top-level packages under app.main:")
+    for mod, us in top:
+        print(f"  {mod:<26} {us / 1000:>9.1f} ms")
+
+    failures: List[str] = []
+    if leaked:
+        failures.append("app.main eagerly imports: " + ", ".join(leaked))
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["modules"]
+        base, cur = baseline.get("app.main"), results.get("app.main")
+        if base and cur and cur > base * (1 + args.tolerance):
+            failures.append(f"app.main import {base}ms -> {cur}ms")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "modules": results,
+        "app_main_top_level": dict(top),
+        "eager_heavy_imports": leaked,
+    }, indent=2))
+    print(f"\nresults saved to {args.output}")
+
+    for line in failures:
+        print("FAIL: " + line)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
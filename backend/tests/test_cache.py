@@ -0,0 +1,101 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.core.cache import Cache, MemoryBackend, SQLiteBackend
+
+
+def sqlite_cache(path, poll_interval=0.05):
+    return Cache(SQLiteBackend(str(path), poll_interval=poll_interval), local_ttl=60)
+
+
+def test_sqlite_workers_see_each_others_writes_and_invalidations(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    a, b = sqlite_cache(path), sqlite_cache(path)
+
+    a.set("workspace:w1", "c1", 60)
+    assert b.get("workspace:w1") == "c1"  # now also in b's local layer
+
+    a.invalidate("workspace:w1")
+    assert a.get("workspace:w1") is None
+    time.sleep(0.1)
+    assert b.get("workspace:w1") is None
+
+
+def test_local_layer_serves_until_poll(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    a, b = sqlite_cache(path), sqlite_cache(path, poll_interval=60)
+    a.set("user:u1", "c1", 60)
+    assert b.get("user:u1") == "c1"
+    a.invalidate("user:u1")
+    # Not polled yet: the local copy is still served
+    assert b.get("user:u1") == "c1"
+
+
+def test_get_or_set_does_not_cache_none():
+    cache = Cache(MemoryBackend())
+    calls = []
+
+    def load():
+        calls.append(1)
+        return None if len(calls) == 1 else "c1"
+
+    assert cache.get_or_set("user:u1", load, 60) is None
+    assert cache.get_or_set("user:u1", load, 60) == "c1"
+    assert cache.get_or_set("user:u1", load, 60) == "c1"
+    assert len(calls) == 2
+
+
+def test_values_round_trip_as_json(tmp_path):
+    cache = sqlite_cache(tmp_path / "cache.sqlite3")
+    cache.set("gh_repos:w1", [{"name": "r", "private": True}], 60)
+    assert cache.get("gh_repos:w1") == [{"name": "r", "private": True}]
+    with pytest.raises(TypeError):
+        cache.set("gh_repos:w1", object(), 60)
+
+
+def test_memory_backend_evicts_by_bytes():
+    backend = MemoryBackend(max_entries=100, max_bytes=10)
+    backend.set("a", b"12345", 60)
+    backend.set("b", b"12345", 60)
+    backend.get("a")  # a is now most recently used
+    backend.set("c", b"123", 60)
+    assert backend.get("b") is None
+    assert backend.get("a") == b"12345"
+    assert backend.get("c") == b"123"
+
+    backend.set("big", b"x" * 11, 60)  # larger than the whole budget
+    assert backend.get("big") is None
+    assert backend.get("a") == b"12345"
+
+
+def test_memory_backend_byte_count_tracks_replace_and_delete():
+    backend = MemoryBackend(max_entries=100, max_bytes=10)
+    backend.set("a", b"12345", 60)
+    backend.set("a", b"1", 60)
+    backend.set("b", b"123456789", 60)
+    assert backend.get("a") == b"1"
+    backend.delete(["a", "b"])
+    backend.set("c", b"x" * 10, 60)
+    assert backend.get("c") == b"x" * 10
+
+
+class BrokenBackend(MemoryBackend):
+    shared = True
+
+    def get(self, key):
+        raise sqlite3.OperationalError("database is locked")
+
+    def set(self, key, value, ttl):
+        raise sqlite3.OperationalError("database is locked")
+
+    def delete(self, keys):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_backend_errors_fall_through_to_loader():
+    cache = Cache(BrokenBackend(), local_ttl=5)
+    assert cache.get_or_set("user:u1", lambda: "c1", 60) == "c1"
+    assert cache.get("user:u1") is None
+    cache.invalidate("user:u1")
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core import github_scheduler
+from app.core.config import settings
+from app.core.github_scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    RateLimited,
+    RateLimitTransport,
+    TokenQuota,
+)
+
+RESERVE = 100
+PACE_BELOW = 200
+
+
+@pytest.fixture(autouse=True)
+def scheduler_settings(monkeypatch):
+    monkeypatch.setattr(settings, "github_interactive_reserve", RESERVE)
+    monkeypatch.setattr(settings, "github_pace_below", PACE_BELOW)
+    monkeypatch.setattr(settings, "github_interactive_max_wait", 0.5)
+    monkeypatch.setattr(github_scheduler, "scheduler", github_scheduler.RateLimitScheduler())
+
+
+def quota(remaining, reset_in=600.0, now=1_000.0):
+    return TokenQuota(remaining=remaining, reset_at=now + reset_in)
+
+
+def test_interactive_waits_for_reset_when_exhausted():
+    q = quota(0, reset_in=30)
+    assert q.delay(INTERACTIVE, 1_000.0) == pytest.approx(30)
+
+
+def test_interactive_raises_rate_limited_beyond_max_wait():
+    q = TokenQuota(remaining=0, reset_at=time.time() + 60)
+    with pytest.raises(RateLimited) as exc:
+        asyncio.run(github_scheduler.scheduler.acquire(q, INTERACTIVE))
+    assert exc.value.retry_after > 50
+    assert q.interactive_waiting == 0
+
+
+def test_interactive_may_spend_the_reserve():
+    q = quota(1)
+    assert q.delay(INTERACTIVE, 1_000.0) == 0
+    assert q.delay(BACKGROUND, 1_000.0) > 0
+
+
+def test_background_respects_reserve():
+    q = quota(RESERVE, reset_in=120)
+    assert q.delay(BACKGROUND, 1_000.0) == pytest.approx(120)
+    q = quota(RESERVE + PACE_BELOW)
+    assert q.delay(BACKGROUND, 1_000.0) == 0
+
+
+def test_background_yields_to_waiting_interactive():
+    q = quota(5_000)
+    q.interactive_waiting = 1
+    assert q.delay(BACKGROUND, 1_000.0) > 0
+
+
+def test_background_is_paced_below_threshold():
+    now = 1_000.0
+    q = quota(RESERVE + 51, reset_in=500, now=now)
+    assert q.delay(BACKGROUND, now) == 0
+    q.reserve(BACKGROUND, now)
+    # 50 calls left above the reserve, spread over the 500 s left in the window
+    assert q.next_background_at == pytest.approx(now + 10)
+    assert q.delay(BACKGROUND, now) == pytest.approx(10)
+    assert q.delay(BACKGROUND, now + 10) == 0
+    assert q.delay(INTERACTIVE, now) == 0
+
+
+def test_background_not_paced_above_threshold():
+    now = 1_000.0
+    q = quota(RESERVE + PACE_BELOW + 10, now=now)
+    q.reserve(BACKGROUND, now)
+    assert q.delay(BACKGROUND, now) == 0
+
+
+def test_window_rollover_forgets_exhausted_quota():
+    q = quota(0, reset_in=30)
+    assert q.delay(BACKGROUND, 1_031.0) == 0
+    assert q.remaining is None
+    assert q.delay(INTERACTIVE, 1_031.0) == 0
+
+
+def test_update_reads_headers():
+    q = TokenQuota()
+    reset = time.time() + 900
+    q.update(httpx.Response(200, headers={
+        "x-ratelimit-limit": "5000",
+        "x-ratelimit-remaining": "4321",
+        "x-ratelimit-reset": str(int(reset)),
+    }), time.time())
+    assert (q.limit, q.remaining, q.reset_at) == (5000, 4321, int(reset))
+
+
+def test_403_with_retry_after_is_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(403, headers={"retry-after": "0"}, json={"message": "secondary rate limit"})
+        return httpx.Response(200, headers={"x-ratelimit-remaining": "4999"}, json={"ok": True})
+
+    async def call():
+        async with httpx.AsyncClient(transport=RateLimitTransport(httpx.MockTransport(handler))) as client:
+            return await client.get("https://api.github.com/user", headers={"Authorization": "token abc"})
+
+    response = asyncio.run(call())
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+def test_403_without_rate_limit_headers_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(403, json={"message": "Resource not accessible"})
+
+    async def call():
+        async with httpx.AsyncClient(transport=RateLimitTransport(httpx.MockTransport(handler))) as client:
+            return await client.get("https://api.github.com/repos/o/r", headers={"Authorization": "token abc"})
+
+    assert asyncio.run(call()).status_code == 403
+    assert len(calls) == 1
+
+
+def test_rate_limited_becomes_429():
+    from app.main import github_rate_limited
+
+    response = asyncio.run(github_rate_limited(None, RateLimited(3.2)))
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "4"
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app.core import iac_parser
+from app.core.config import settings
+
+CLOUDFORMATION = """\
+AWSTemplateFormatVersion: "2010-09-09"
+Conditions:
+  IsProd: !Equals [!Ref Env, prod]
+Resources:
+  Bucket:
+    Type: AWS::S3::Bucket
+    Condition: IsProd
+    Properties:
+      BucketName: !Sub "${AWS::StackName}-logs"
+      Tags:
+        - Key: arn
+          Value: !GetAtt Role.Arn
+        - Key: zone
+          Value: !Select [0, !GetAZs ""]
+"""
+
+
+def test_yaml_cloudformation_short_forms():
+    blob, error = iac_parser._parse_to_blob(iac_parser.YAML, CLOUDFORMATION)
+    assert error is None
+    (doc,) = iac_parser._decode(blob)
+    assert doc["Conditions"]["IsProd"] == {"Fn::Equals": [{"Ref": "Env"}, "prod"]}
+    props = doc["Resources"]["Bucket"]["Properties"]
+    assert props["BucketName"] == {"Fn::Sub": "${AWS::StackName}-logs"}
+    assert props["Tags"][0]["Value"] == {"Fn::GetAtt": ["Role", "Arn"]}
+    assert props["Tags"][1]["Value"] == {"Fn::Select": [0, {"Fn::GetAZs": ""}]}
+
+
+def test_yaml_other_tags_are_kept():
+    content = "test:\n  script:\n    - !reference [.setup, script]\n"
+    blob, error = iac_parser._parse_to_blob(iac_parser.YAML, content)
+    assert error is None
+    (doc,) = iac_parser._decode(blob)
+    assert doc["test"]["script"] == [{"!reference": [".setup", "script"]}]
+
+
+def test_yaml_still_refuses_python_tags():
+    _, error = iac_parser._parse_to_blob(iac_parser.YAML, "x: !!python/object/apply:os.system [id]\n")
+    assert error is not None
+
+
+@pytest.fixture
+def parser_env(monkeypatch):
+    monkeypatch.setattr(settings, "iac_parse_workers", 2)
+    monkeypatch.setattr(iac_parser, "_ast_cache", None)
+    yield
+    iac_parser.shutdown_pool()
+
+
+def parses(kind, result):
+    return iac_parser.IAC_PARSES.value(kind=kind, result=result)
+
+
+def test_identical_content_is_parsed_once(parser_env):
+    tf = 'resource "aws_s3_bucket" "logs" {\n  bucket = "logs-once"\n}\n'
+    before = parses(iac_parser.TERRAFORM, "parsed")
+    parsed = asyncio.run(iac_parser.IaCParser().parse_many({"a/main.tf": tf, "b/main.tf": tf}))
+    assert parses(iac_parser.TERRAFORM, "parsed") - before == 1
+    assert parsed["a/main.tf"].digest == parsed["b/main.tf"].digest
+    assert parsed["a/main.tf"].ast == parsed["b/main.tf"].ast
+    assert parsed["a/main.tf"].ast["resource"]
+
+
+def test_parse_error_is_reported_not_raised(parser_env):
+    parsed = asyncio.run(iac_parser.IaCParser().parse_many({"bad.tf": "resource {", "notes.txt": "x"}))
+    assert list(parsed) == ["bad.tf"]
+    assert not parsed["bad.tf"].ok
+    assert "Unexpected" in parsed["bad.tf"].error
+    assert parsed["bad.tf"].ast is None
+
+
+def test_second_parser_hits_ast_cache(parser_env):
+    files = {"k8s/app.yaml": "kind: Pod\nmetadata:\n  name: cached\n"}
+    asyncio.run(iac_parser.IaCParser().parse_many(files))
+    hits, parsed_before = parses(iac_parser.YAML, "hit"), parses(iac_parser.YAML, "parsed")
+    parsed = asyncio.run(iac_parser.IaCParser().parse_many(files))
+    assert parses(iac_parser.YAML, "hit") - hits == 1
+    assert parses(iac_parser.YAML, "parsed") == parsed_before
+    assert parsed["k8s/app.yaml"].ast == [{"kind": "Pod", "metadata": {"name": "cached"}}]
+
+
+def test_dockerfile_continuations(parser_env):
+    dockerfile = (
+        "# build image\n"
+        "FROM python:3.11-slim AS base\n"
+        "\n"
+        "RUN apt-get update \\\n"
+        "    && apt-get install -y curl \\\n"
+        "    && rm -rf /var/lib/apt/lists/*\n"
+        "USER app\n"
+    )
+    parsed = asyncio.run(iac_parser.IaCParser().parse_many({"Dockerfile": dockerfile}))
+    assert parsed["Dockerfile"].ast == [
+        {"instruction": "FROM", "value": "python:3.11-slim AS base", "line_start": 2, "line_end": 2},
+        {
+            "instruction": "RUN",
+            "value": "apt-get update && apt-get install -y curl && rm -rf /var/lib/apt/lists/*",
+            "line_start": 4,
+            "line_end": 6,
+        },
+        {"instruction": "USER", "value": "app", "line_start": 7, "line_end": 7},
+    ]